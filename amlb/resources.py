@@ -191,6 +191,15 @@ class Resources:
         log.debug("Available task definitions:\n%s", tasks)
         return tasks, benchmark_name, benchmark_path
 
+    @memoize
+    def benchmark_tasks(self, name):
+        """
+        :param name: name of the benchmark, as for `benchmark_definition`.
+        :return: the task definitions of the benchmark with default settings, loaded only once for this instance.
+        """
+        tasks, _, _ = self.benchmark_definition(name)
+        return tasks
+
     def _validate_task(self, task, lenient=False):
         missing = []
         for conf in ['name']:
@@ -2,23 +2,25 @@
 **results** module provides the logic to format, save and read predictions generated by the *automl frameworks* (cf. ``TaskResult``),
 as well as logic to compute, format, save, read and merge scores obtained from those predictions (cf. ``Result`` and ``Scoreboard``).
 """
-from functools import partial
 import collections
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import functools
 import io
 import logging
 import math
 import os
 import re
-import statistics
 
 import numpy as np
 from numpy import nan, sort
 import pandas as pd
+from pandas.api.types import is_float_dtype, is_numeric_dtype
 
 from .data import Dataset, DatasetType, Feature
-from .datautils import accuracy_score, confusion_matrix, f1_score, log_loss, balanced_accuracy_score, mean_absolute_error, mean_squared_error, mean_squared_log_error, r2_score, roc_auc_score, read_csv, write_csv, is_data_frame, to_data_frame
-from .resources import get as rget, config as rconfig, output_dirs
-from .utils import Namespace, backup_file, cached, datetime_iso, json_load, memoize, profile
+from .datautils import accuracy_score, balanced_accuracy_score, confusion_matrix, f1_score, log_loss, mean_absolute_error, mean_squared_error, mean_squared_log_error, r2_score, roc_auc_score, read_csv, write_csv, is_data_frame, to_data_frame
+from .resources import get as rget, config as rconfig, from_config as rfrom_config, output_dirs
+from .utils import Namespace, backup_file, cached, datetime_iso, json_dump, json_load, memoize, profile, touch
 
 log = logging.getLogger(__name__)
 
@@ -30,6 +32,66 @@ class NoResultError(Exception):
 class ResultError(Exception):
     pass
 
+def _round_as_printed(values, shift, fmt):
+    """
+    rounds `values` to `shift` decimal places (per value, negative for the integer digits),
+    returning exactly `float(fmt(v))` for each value: the numerical rounding is exact except close to a tie
+    or outside the range of exact powers of 10, in which case the few values concerned are formatted individually.
+    """
+    shift = np.broadcast_to(shift, values.shape)
+    with np.errstate(all='ignore'):
+        scale = 10.0 ** np.abs(shift)
+        scaled = np.where(shift >= 0, values * scale, values / scale)
+        rounded = np.rint(scaled)
+        result = np.where(shift >= 0, rounded / scale, rounded * scale)
+        near_tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) <= np.abs(scaled) * 1e-15
+    rounding = np.isfinite(values) & (values != 0)  # other values are printed unchanged
+    result = np.where(rounding, result, values)
+    inexact = rounding & (near_tie | (np.abs(shift) > 22) | ~(np.abs(rounded) < 2**53))
+    if inexact.any():
+        result[inexact] = [float(fmt(v)) for v in values[inexact]]
+    return result
+
+
+def _round_significant(values, digits):
+    """vectorized equivalent of `float(f"{v:.{digits}g}")`"""
+    values = np.asarray(values, dtype=float)
+    fmt = f"{{:.{digits}g}}".format
+    with np.errstate(all='ignore'):
+        exponent = np.log10(np.abs(values))
+        # log10 is not exact, so the magnitude may be wrong for values very close to a power of 10.
+        near_power = np.abs(exponent - np.rint(exponent)) < 1e-9
+    magnitude = np.where(np.isfinite(exponent), np.floor(exponent), 0)
+    result = _round_as_printed(values, digits - 1 - magnitude, fmt)
+    if near_power.any():
+        result[near_power] = [float(fmt(v)) for v in values[near_power]]
+    return result
+
+
+def _round_decimals(values, decimals):
+    """vectorized equivalent of `float(f"{v:.{decimals}f}")`"""
+    return _round_as_printed(np.asarray(values, dtype=float), decimals, f"{{:.{decimals}f}}".format)
+
+
+@functools.lru_cache(maxsize=4)
+def _scoreboard_file_patterns(sep, results_file):
+    return [re.compile(pat) for pat in [
+        results_file,
+        rf"(?P<framework>[\w\-]+){sep}benchmark{sep}(?P<benchmark>[\w\-]+)\.csv",
+        rf"benchmark{sep}(?P<benchmark>[\w\-]+)\.csv",
+        rf"(?P<framework>[\w\-]+){sep}task{sep}(?P<task>[\w\-]+)\.csv",
+        rf"task{sep}(?P<task>[\w\-]+)\.csv",
+        r"(?P<framework>[\w\-]+)\.csv",
+    ]]
+
+
+@functools.lru_cache(maxsize=4)
+def _predictions_file_patterns(sep):
+    folder_pat = rf"/(?P<framework>[\w\-]+?){sep}(?P<benchmark>[\w\-]+){sep}(?P<constraint>[\w\-]+){sep}(?P<mode>[\w\-]+)({sep}(?P<datetime>\d{8}T\d{6}))/"
+    file_pat = rf"(?P<framework>[\w\-]+?){sep}(?P<task>[\w\-]+){sep}(?P<fold>\d+)\.(csv|feather|parquet)"
+    return re.compile(folder_pat), re.compile(file_pat)
+
+
 # TODO: reconsider organisation of output files:
 #   predictions: add framework version to name, timestamp? group into subdirs?
 
@@ -48,17 +110,9 @@ class Scoreboard:
         framework_name = None
         benchmark_name = None
         task_name = None
-        patterns = [
-            cls.results_file,
-            rf"(?P<framework>[\w\-]+){sep}benchmark{sep}(?P<benchmark>[\w\-]+)\.csv",
-            rf"benchmark{sep}(?P<benchmark>[\w\-]+)\.csv",
-            rf"(?P<framework>[\w\-]+){sep}task{sep}(?P<task>[\w\-]+)\.csv",
-            rf"task{sep}(?P<task>[\w\-]+)\.csv",
-            r"(?P<framework>[\w\-]+)\.csv",
-        ]
         found = False
-        for pat in patterns:
-            m = re.fullmatch(pat, basename)
+        for pat in _scoreboard_file_patterns(sep, cls.results_file):
+            m = pat.fullmatch(basename)
             if m:
                 found = True
                 d = m.groupdict()
@@ -89,9 +143,10 @@ class Scoreboard:
         exists = os.path.isfile(path)
         new_format = False
         if exists:
-            df = read_csv(path, nrows=1)
-            new_format = list(df.columns) != list(data_frame.columns)
-        if new_format or (exists and not append):
+            with open(path, newline='') as f:
+                columns = next(csv.reader(f), [])  # header only, no need to go through pandas
+            new_format = columns != list(data_frame.columns)
+        if (new_format or (exists and not append)) and rconfig().results.backup.scores:
             backup_file(path)
         new_file = not exists or not append or new_format
         is_default_index = data_frame.index.name is None and not any(data_frame.index.names)
@@ -107,8 +162,10 @@ class Scoreboard:
         self.framework_name = framework_name
         self.benchmark_name = benchmark_name
         self.task_name = task_name
-        self.scores_dir = (scores_dir if scores_dir
-                           else output_dirs(rconfig().output_dir, rconfig().sid, ['scores']).scores)
+        if not scores_dir:
+            cfg = rconfig()
+            scores_dir = output_dirs(cfg.output_dir, cfg.sid, ['scores']).scores
+        self.scores_dir = scores_dir
         self.scores = scores if scores is not None else self._load()
 
     @cached
@@ -133,21 +190,27 @@ class Scoreboard:
     def as_printable_data_frame(self):
         str_print = lambda val: '' if val in [None, '', 'None'] or (isinstance(val, float) and np.isnan(val)) else val
         int_print = lambda val: int(val) if isinstance(val, float) and not np.isnan(val) else str_print(val)
-        num_print = lambda fn, val: None if isinstance(val, str) else fn(val)
 
-        df = self.as_data_frame()
+        df = self.as_data_frame().copy()  # don't alter the cached data frame
         force_str_cols = ['id']
         nanable_int_cols = ['fold', 'models_count', 'seed']
         low_precision_float_cols = ['duration', 'training_duration', 'predict_duration']
-        high_precision_float_cols = [col for col in df.select_dtypes(include=[np.float]).columns if col not in ([] + nanable_int_cols + low_precision_float_cols)]
+        float_cols = [col for col, dt in df.dtypes.items() if is_float_dtype(dt)]
+        high_precision_float_cols = [col for col in float_cols if col not in ([] + nanable_int_cols + low_precision_float_cols)]
         for col in force_str_cols:
-            df[col] = df[col].astype(np.object).map(str_print).astype(np.str)
+            values = df[col].astype(object)
+            df[col] = values.mask(values.isna() | values.isin(['', 'None']), '').astype(str)
         for col in nanable_int_cols:
-            df[col] = df[col].astype(np.object).map(int_print).astype(np.str)
+            if is_numeric_dtype(df[col]):
+                values = df[col].to_numpy(dtype=float)
+                missing = np.isnan(values)
+                df[col] = np.where(missing, '', np.char.mod('%d', np.where(missing, 0, values)))  # '%d' truncates like int()
+            else:  # mixed content: falling back to per-value formatting
+                df[col] = df[col].astype(object).map(int_print).astype(str)
         for col in low_precision_float_cols:
-            df[col] = df[col].astype(np.float).map(partial(num_print, "{:.1f}".format)).astype(np.float)
+            df[col] = _round_decimals(df[col], 1)
         for col in high_precision_float_cols:
-            df[col] = df[col].map(partial(num_print, "{:.6g}".format)).astype(np.float)
+            df[col] = _round_significant(df[col], 6)
         return df
 
     def _load(self):
@@ -158,9 +221,10 @@ class Scoreboard:
 
     def append(self, board_or_df, no_duplicates=True):
         to_append = board_or_df.as_data_frame() if isinstance(board_or_df, Scoreboard) else board_or_df
-        scores = self.as_data_frame().append(to_append, sort=False)
+        scores = pd.concat([self.as_data_frame(), to_append], ignore_index=True, sort=False, copy=False)
         if no_duplicates:
-            scores = scores.drop_duplicates()
+            scores.drop_duplicates(inplace=True)
+            scores.reset_index(drop=True, inplace=True)
         return Scoreboard(scores=scores,
                           framework_name=self.framework_name,
                           benchmark_name=self.benchmark_name,
@@ -191,16 +255,35 @@ class TaskResult:
 
     @staticmethod
     # @profile(logger=log)
-    def load_predictions(predictions_file):
+    def load_predictions(predictions_file, dir_files=None):
+        """
+        :param predictions_file:
+        :param dir_files: the listing of the predictions file directory if already known:
+            used instead of probing the filesystem for each file (expensive on network filesystems).
+        :return: a Result instance.
+        """
         log.info("Loading predictions from `%s`.", predictions_file)
-        if os.path.isfile(predictions_file):
+        if TaskResult._file_exists(predictions_file, dir_files):
             try:
-                df = read_csv(predictions_file, dtype=object)
+                target_is_encoded = TaskResult._load_predictions_meta(predictions_file, dir_files).target_is_encoded
+                try:
+                    df = TaskResult._read_predictions(predictions_file, target_is_encoded=target_is_encoded)
+                except ValueError:
+                    if target_is_encoded is not True:
+                        raise
+                    # e.g. predictions file overwritten by a framework writing its predictions directly.
+                    log.warning("Predictions in `%s` are not encoded as stated in their metadata: ignoring stale metadata.", predictions_file)
+                    target_is_encoded = None
+                    df = TaskResult._read_predictions(predictions_file, target_is_encoded=target_is_encoded)
+                if df.shape[1] > 2 and target_is_encoded is None:
+                    target_is_encoded = TaskResult._guess_target_is_encoded(df)
+                    if target_is_encoded:
+                        df = df.astype(dict(predictions=int, truth=int))
                 log.debug("Predictions preview:\n %s\n", df.head(10).to_string())
                 if rconfig().test_mode:
-                    TaskResult.validate_predictions(df)
+                    TaskResult.validate_predictions(df, target_is_encoded=target_is_encoded)
                 if df.shape[1] > 2:
-                    return ClassificationResult(df)
+                    return ClassificationResult(df, target_is_encoded=target_is_encoded)
                 else:
                     return RegressionResult(df)
             except Exception as e:
@@ -210,9 +293,58 @@ class TaskResult:
             return NoResult("Missing predictions.")
 
     @staticmethod
-    def load_metadata(metadata_file):
+    def _read_predictions(predictions_file, target_is_encoded=False):
+        ext = os.path.splitext(predictions_file)[1]
+        if ext == '.feather':
+            df = pd.read_feather(predictions_file)
+        elif ext == '.parquet':
+            df = pd.read_parquet(predictions_file)
+        else:
+            # peeking at the header to type the columns upfront,
+            # so that they're directly parsed into native arrays instead of python objects.
+            columns = read_csv(predictions_file, nrows=0).columns
+            return read_csv(predictions_file, dtype=TaskResult._predictions_dtypes(columns, target_is_encoded))
+        return df.astype(TaskResult._predictions_dtypes(df.columns, target_is_encoded), copy=False)
+
+    @staticmethod
+    def _predictions_dtypes(columns, target_is_encoded=False):
+        if len(columns) > 2:  # classification
+            dtype = {col: float for col in columns[:-2]}
+            label_type = int if target_is_encoded is True else str
+            dtype.update(predictions=label_type, truth=label_type)
+        else:  # regression
+            dtype = {col: float for col in columns}
+        return dtype
+
+    @staticmethod
+    def _load_predictions_meta(predictions_file, dir_files=None):
+        """
+        predictions metadata are only saved for classification predictions by `save_predictions`:
+        for predictions written by other means (e.g. directly by R frameworks), the encoding is unknown.
+        """
+        meta_file = TaskResult._predictions_meta_file(predictions_file)
+        return (json_load(meta_file, as_namespace=True) if TaskResult._file_exists(meta_file, dir_files)
+                else Namespace(lambda: None))
+
+    @staticmethod
+    def _guess_target_is_encoded(predictions: pd.DataFrame):
+        """
+        for classification predictions without metadata:
+        truth and predictions are considered encoded if they're all valid label indices and don't all match the class labels.
+        """
+        labels = set(predictions.columns[:-2])
+        values = pd.unique(predictions.iloc[:, -2:].to_numpy().ravel())
+        return (all(isinstance(v, str) and v.isdigit() and int(v) < len(labels) for v in values)
+                and not all(v in labels for v in values))
+
+    @staticmethod
+    def _predictions_meta_file(predictions_file):
+        return f"{os.path.splitext(predictions_file)[0]}.meta.json"
+
+    @staticmethod
+    def load_metadata(metadata_file, dir_files=None):
         log.info("Loading metadata from `%s`.", metadata_file)
-        if os.path.isfile(metadata_file):
+        if TaskResult._file_exists(metadata_file, dir_files):
             return json_load(metadata_file, as_namespace=True)
         else:
             log.warning("Metadata file `%s` is missing: framework either couldn't start or implementation doesn't save metadata.", metadata_file)
@@ -225,7 +357,7 @@ class TaskResult:
                          probabilities=None, probabilities_labels=None,
                          target_is_encoded=False,
                          preview=True):
-        """ Save class probabilities and predicted labels to file in csv format.
+        """ Save class probabilities and predicted labels to file in the format defined by `results.predictions_format` (csv by default).
 
         :param dataset:
         :param output_file:
@@ -237,6 +369,9 @@ class TaskResult:
         :param preview:
         :return: None
         """
+        results_cfg = rconfig().results
+        predictions_format = results_cfg.predictions_format
+        output_file = TaskResult._predictions_path(output_file, predictions_format)
         log.debug("Saving predictions to `%s`.", output_file)
         remap = None
         if probabilities is not None:
@@ -245,33 +380,56 @@ class TaskResult:
             if probabilities_labels:
                 df = df[sort(prob_cols)]  # reorder columns alphabetically: necessary to match label encoding
                 if any(prob_cols != df.columns.values):
-                    encoding_map = {prob_cols.index(col): i for i, col in enumerate(df.columns.values)}
-                    remap = np.vectorize(lambda v: encoding_map[v])
+                    encoding_lut = np.array([df.columns.get_loc(col) for col in prob_cols])  # original index -> sorted index
+                    remap = lambda v: encoding_lut[np.asarray(v, dtype=int)]
         else:
             df = to_data_frame(None)
 
-        preds = predictions
         truth = truth if truth is not None else dataset.test.y
+        if target_is_encoded and remap:
+            predictions = remap(predictions)
+            truth = remap(truth)
+        preds = predictions
+        saved_encoded = _encode_predictions_and_truth_
         if not _encode_predictions_and_truth_ and target_is_encoded:
-            if remap:
-                predictions = remap(predictions)
-                truth = remap(truth)
             preds = dataset.target.label_encoder.inverse_transform(predictions)
             truth = dataset.target.label_encoder.inverse_transform(truth)
         if _encode_predictions_and_truth_ and not target_is_encoded:
-            preds = dataset.target.label_encoder.transform(predictions)
-            truth = dataset.target.label_encoder.transform(truth)
+            if probabilities is None or TaskResult._labels_match_encoding(df.columns, dataset.target):
+                preds = dataset.target.label_encoder.transform(predictions)
+                truth = dataset.target.label_encoder.transform(truth)
+            else:
+                # the probability columns (e.g. classes seen during training only) don't match the dataset classes:
+                # encoding with the latter would produce indices inconsistent with the columns, so labels are saved as is.
+                saved_encoded = False
 
         df = df.assign(predictions=preds)
         df = df.assign(truth=truth)
         if preview:
             log.info("Predictions preview:\n %s\n", df.head(20).to_string())
-        backup_file(output_file)
-        write_csv(df, path=output_file)
+        if results_cfg.backup.predictions:
+            backup_file(output_file)
+        if predictions_format == 'feather':
+            touch(output_file)
+            df.rename(columns=str).to_feather(output_file)
+        elif predictions_format == 'parquet':
+            touch(output_file)
+            df.rename(columns=str).to_parquet(output_file, compression='zstd')
+        else:
+            write_csv(df, path=output_file)
+        if probabilities is not None:
+            # when encoded, truth and predictions are indices of the probability columns.
+            json_dump(dict(target_is_encoded=saved_encoded), TaskResult._predictions_meta_file(output_file))
         log.info("Predictions saved to `%s`.", output_file)
 
     @staticmethod
-    def validate_predictions(predictions: pd.DataFrame):
+    def _labels_match_encoding(labels, target: Feature):
+        """true if the given labels are exactly the classes of the target label encoder, in encoding order"""
+        classes = target.label_encoder.classes
+        return classes is not None and np.array_equal(target.normalize(labels), np.asarray(classes, dtype=str))
+
+    @staticmethod
+    def validate_predictions(predictions: pd.DataFrame, target_is_encoded=False):
         names = predictions.columns.values
         assert len(names) >= 2, "predictions frame should have 2 columns (regression) or more (classification)"
         assert names[-1] == "truth", "last column of predictions frame must be named `truth`"
@@ -282,42 +440,45 @@ class TaskResult:
         else:  # classification
             predictors = names[:-2]
             probabilities, preds, truth = predictions.iloc[:,:-2], predictions.iloc[:,-2], predictions.iloc[:,-1]
-            assert np.array_equal(predictors, np.sort(predictors)), "Predictors columns are not sorted in lexicographic order."
-            assert set(np.unique(predictors)) == set(predictors), "Predictions contain multiple columns with the same label."
+            predictors_index = pd.Index(predictors)
+            assert predictors_index.is_monotonic_increasing, "Predictors columns are not sorted in lexicographic order."
+            assert predictors_index.is_unique, "Predictions contain multiple columns with the same label."
             for name, col in probabilities.items():
                 pd.to_numeric(col)  # pandas will raise if we have non-numerical values
 
-            if _encode_predictions_and_truth_:
+            col_argmax = probabilities.to_numpy(dtype=float).argmax(axis=1)
+            if target_is_encoded:
                 assert np.array_equal(truth, truth.astype(int)), "Values in truth column are not encoded."
                 assert np.array_equal(preds, preds.astype(int)), "Values in predictions column are not encoded."
                 predictors_set = set(range(len(predictors)))
-                validate_row = lambda r: r[:-2].astype(float).values.argmax() == r[-2]
+                expected = preds.to_numpy().astype(int)
             else:
                 predictors_set = set(predictors)
-                validate_row = lambda r: r[:-2].astype(float).idxmax() == r[-2]
+                col_argmax = predictors[col_argmax]
+                expected = preds.to_numpy()
 
-            truth_set = set(truth.unique())
+            truth_set = set(pd.unique(truth))
             if predictors_set < truth_set:
                 log.warning("Truth column contains values unseen during training: no matching probability column.")
             if predictors_set > truth_set:
                 log.warning("Truth column doesn't contain all the possible target values: the test dataset may be too small.")
-            predictions_set = set(preds.unique())
+            predictions_set = set(pd.unique(preds))
             assert predictions_set <= predictors_set, "Predictions column contains unexpected values: {}.".format(predictions_set - predictors_set)
-            assert predictions.apply(validate_row, axis=1).all(), "Predictions don't always match the predictor with the highest probability."
+            assert (col_argmax == expected).all(), "Predictions don't always match the predictor with the highest probability."
 
     @classmethod
     def score_from_predictions_file(cls, path):
-        sep = rconfig().token_separator
+        cfg = rconfig()
+        sep = cfg.token_separator
         folder, basename = os.path.split(path)
         folder_g = collections.defaultdict(lambda: None)
+        folder_pat, file_pat = _predictions_file_patterns(sep)
         if folder:
-            folder_pat = rf"/(?P<framework>[\w\-]+?){sep}(?P<benchmark>[\w\-]+){sep}(?P<constraint>[\w\-]+){sep}(?P<mode>[\w\-]+)({sep}(?P<datetime>\d{8}T\d{6}))/"
-            folder_m = re.match(folder_pat, folder)
+            folder_m = folder_pat.match(folder)
             if folder_m:
                 folder_g = folder_m.groupdict()
 
-        file_pat = rf"(?P<framework>[\w\-]+?){sep}(?P<task>[\w\-]+){sep}(?P<fold>\d+)\.csv"
-        file_m = re.fullmatch(file_pat, basename)
+        file_m = file_pat.fullmatch(basename)
         if not file_m:
             log.error("Predictions file `%s` has wrong naming format.", path)
             return None
@@ -331,35 +492,53 @@ class TaskResult:
         task = Namespace(name=task_name, id=task_name)
         if benchmark:
             try:
-                tasks, _, _ = rget().benchmark_definition(benchmark)
+                tasks = rget().benchmark_tasks(benchmark)  # cached per resources: reloading the config never serves stale definitions
                 task = next(t for t in tasks if t.name==task_name)
             except:
                 pass
 
         result = cls.load_predictions(path)
         task_result = cls(task, fold, constraint, '')
-        metrics = rconfig().benchmarks.metrics[result.type.name]
-        return task_result.compute_scores(framework_name, metrics, result=result)
+        metrics = cfg.benchmarks.metrics[result.type.name] if result.type else []
+        metadata = Namespace(lambda: None, framework=framework_name, metric=metrics[0] if metrics else None, metrics=metrics)
+        return task_result.compute_scores(result=result, metadata=metadata)
+
+    @classmethod
+    def score_from_predictions_files(cls, paths, parallel_jobs=None):
+        """
+        computes the scores for several predictions files in parallel processes:
+        loading predictions and computing the metrics is mostly cpu-bound, so threads wouldn't help here.
+
+        :param paths: the predictions files to score.
+        :param parallel_jobs: the max number of processes, defaults to the number of cores.
+        :return: a Scoreboard with the scores of all the predictions files that could be scored.
+        """
+        with ProcessPoolExecutor(max_workers=parallel_jobs,
+                                 initializer=rfrom_config, initargs=(rget()._config,)) as executor:  # spawned processes don't inherit the app resources
+            scores = list(executor.map(cls.score_from_predictions_file, paths))
+        return Scoreboard(scores=[sc for sc in scores if sc is not None])
 
     def __init__(self, task_def, fold: int, constraint: str, predictions_dir=None):
         self.task = task_def
         self.fold = fold
         self.constraint = constraint
-        self.predictions_dir = (predictions_dir if predictions_dir
-                                else output_dirs(rconfig().output_dir, rconfig().sid, ['predictions']).predictions)
+        if not predictions_dir:
+            cfg = rconfig()
+            predictions_dir = output_dirs(cfg.output_dir, cfg.sid, ['predictions']).predictions
+        self.predictions_dir = predictions_dir
 
     @memoize
     def get_result(self):
-        return self.load_predictions(self._predictions_file)
+        return self.load_predictions(self._find_predictions_file(), self._fold_files())
 
     @memoize
     def get_metadata(self):
-        return self.load_metadata(self._metadata_file)
+        return self.load_metadata(self._metadata_file, self._fold_files())
 
     @profile(logger=log)
-    def compute_scores(self, result=None, meta_result=None):
+    def compute_scores(self, result=None, meta_result=None, metadata=None):
         meta_result = Namespace({} if meta_result is None else meta_result)
-        metadata = self.get_metadata()
+        metadata = self.get_metadata() if metadata is None else metadata
         scores = Namespace(
             id=self.task.id,
             task=self.task.name,
@@ -402,11 +581,41 @@ class TaskResult:
 
     @property
     def _predictions_file(self):
-        return os.path.join(self.predictions_dir, self.task.name, str(self.fold), "predictions.csv")
+        return os.path.join(self._fold_dir, "predictions.csv")
+
+    def _find_predictions_file(self):
+        # frameworks writing their predictions directly (not through `save_predictions`) always use csv.
+        candidates = [self._predictions_path(self._predictions_file, fmt)
+                      for fmt in [rconfig().results.predictions_format, 'csv']]
+        return next((f for f in candidates if self._file_exists(f, self._fold_files())), self._predictions_file)
+
+    @cached
+    def _fold_files(self):
+        """
+        lists the fold directory once for all the files lookups (predictions, predictions metadata, framework metadata)
+        instead of probing each file separately (expensive on network filesystems).
+        must only be called once the framework is done: the listing is not refreshed.
+        """
+        try:
+            return set(os.listdir(self._fold_dir))
+        except FileNotFoundError:
+            return set()
+
+    @staticmethod
+    def _file_exists(path, dir_files=None):
+        return os.path.isfile(path) if dir_files is None else os.path.basename(path) in dir_files
+
+    @staticmethod
+    def _predictions_path(predictions_file, predictions_format):
+        return f"{os.path.splitext(predictions_file)[0]}.{predictions_format}"
 
     @property
     def _metadata_file(self):
-        return os.path.join(self.predictions_dir, self.task.name, str(self.fold), "metadata.json")
+        return os.path.join(self._fold_dir, "metadata.json")
+
+    @property
+    def _fold_dir(self):
+        return os.path.join(self.predictions_dir, self.task.name, str(self.fold))
 
 
 class Result:
@@ -414,11 +623,12 @@ class Result:
     def __init__(self, predictions_df, info=None):
         self.df = predictions_df
         self.info = info
-        self.truth = self.df.iloc[:, -1].values if self.df is not None else None
-        self.predictions = self.df.iloc[:, -2].values if self.df is not None else None
+        self.truth = self.df.iloc[:, -1].to_numpy() if self.df is not None else None
+        self.predictions = self.df.iloc[:, -2].to_numpy() if self.df is not None else None
         self.target = None
         self.type = None
 
+    @memoize
     def evaluate(self, metric):
         if hasattr(self, metric):
             try:
@@ -452,21 +662,32 @@ class ErrorResult(NoResult):
 
 class ClassificationResult(Result):
 
-    def __init__(self, predictions_df, info=None):
+    def __init__(self, predictions_df, info=None, target_is_encoded=False):
         super().__init__(predictions_df, info)
-        self.classes = self.df.columns[:-2].values.astype(str, copy=False)
-        self.probabilities = self.df.iloc[:, :-2].values.astype(float, copy=False)
+        self.target_is_encoded = target_is_encoded
+        self.classes = self.df.columns[:-2].to_numpy(dtype=str)
+        self.probabilities = self.df.iloc[:, :-2].to_numpy(dtype=float, copy=False)
         self.target = Feature(0, 'class', 'categorical', values=self.classes, is_target=True)
         self.type = DatasetType.binary if len(self.classes) == 2 else DatasetType.multiclass
-        self.truth = self._autoencode(self.truth.astype(str, copy=False))
-        self.predictions = self._autoencode(self.predictions.astype(str, copy=False))
-        self.labels = self._autoencode(self.classes)
+        if not self.target_is_encoded:
+            # encoding truth and predictions together to go through the encoder only once
+            encoded = self.target.label_encoder.transform(np.concatenate([self.truth, self.predictions]))
+            self.truth, self.predictions = encoded[:len(self.truth)], encoded[len(self.truth):]
+        self.labels = self.target.label_encoder.transform(self.classes)
+        self.df = None  # all needed data was extracted: releasing the frame before computing the metrics
 
     def acc(self):
-        return float(accuracy_score(self.truth, self.predictions))
+        if not self._cm_is_complete():
+            return float(accuracy_score(self.truth, self.predictions))
+        _, _, diag = self._cm_sums()
+        return float(diag.sum() / self.cm().sum())
 
     def balacc(self):
-        return float(balanced_accuracy_score(self.truth, self.predictions))
+        if not self._cm_is_complete():
+            return float(balanced_accuracy_score(self.truth, self.predictions))
+        row_sums, _, diag = self._cm_sums()
+        present = row_sums > 0  # as in sklearn, classes absent from truth are ignored
+        return float((diag[present] / row_sums[present]).mean())
 
     def auc(self):
         if self.type != DatasetType.binary:
@@ -475,38 +696,58 @@ class ClassificationResult(Result):
             return nan
         return float(roc_auc_score(self.truth, self.probabilities[:, 1], labels=self.labels))
 
+    @cached
     def cm(self):
         return confusion_matrix(self.truth, self.predictions, labels=self.labels)
 
+    @cached
+    def _cm_sums(self):
+        """per class (truth counts, predicted counts, correct predictions), shared by most metrics"""
+        cm = self.cm()
+        return cm.sum(axis=1), cm.sum(axis=0), np.diag(cm)
+
+    @cached
+    def _cm_is_complete(self):
+        """
+        the confusion matrix ignores the samples whose truth or prediction is not one of the labels (only possible with encoded predictions):
+        in this case, the metrics that count those samples are delegated to sklearn.
+        """
+        return self.cm().sum() == len(self.truth)
+
     def _per_class_errors(self):
-        return [(s-d)/s for s, d in ((sum(r), r[i]) for i, r in enumerate(self.cm()))]
+        row_sums, _, diag = self._cm_sums()
+        return (row_sums - diag) / row_sums
 
     def mean_pce(self):
         """mean per class error"""
-        return statistics.mean(self._per_class_errors())
+        return float(self._per_class_errors().mean())
 
     def max_pce(self):
         """max per class error"""
-        return max(self._per_class_errors())
+        return float(self._per_class_errors().max())
 
     def f1(self):
-        return float(f1_score(self.truth, self.predictions, labels=self.labels))
+        if self.type != DatasetType.binary:
+            raise ValueError(f"F1 metric is only supported for binary classification: {self.labels}.")
+        if not self._cm_is_complete():
+            return float(f1_score(self.truth, self.predictions, labels=self.labels))
+        row_sums, col_sums, diag = self._cm_sums()
+        pos = int(np.flatnonzero(self.labels == 1)[0])  # positive class is the one encoded as 1, not necessarily the 2nd column
+        tp = diag[pos]
+        denom = row_sums[pos] + col_sums[pos]
+        return float(2 * tp / denom) if denom else 0.
 
     def logloss(self):
         return float(log_loss(self.truth, self.probabilities, labels=self.labels))
 
-    def _autoencode(self, vec):
-        needs_encoding = not _encode_predictions_and_truth_ or (isinstance(vec[0], str) and not vec[0].isdigit())
-        return self.target.label_encoder.transform(vec) if needs_encoding else vec
-
 
 class RegressionResult(Result):
 
     def __init__(self, predictions_df, info=None):
         super().__init__(predictions_df, info)
-        self.truth = self.truth.astype(float, copy=False)
         self.target = Feature(0, 'target', 'real', is_target=True)
         self.type = DatasetType.regression
+        self.df = None  # all needed data was extracted: releasing the frame before computing the metrics
 
     def mae(self):
         return float(mean_absolute_error(self.truth, self.predictions))
@@ -527,6 +768,6 @@ class RegressionResult(Result):
         return float(r2_score(self.truth, self.predictions))
 
 
-_encode_predictions_and_truth_ = False
+_encode_predictions_and_truth_ = True
 
 save_predictions = TaskResult.save_predictions
@@ -13,8 +13,10 @@ from amlb.utils import config_load
 root_dir = os.path.dirname(__file__)
 
 parser = argparse.ArgumentParser()
-parser.add_argument('predictions', type=str,
-                    help='The predictions file to load and compute the scores for.')
+parser.add_argument('predictions', type=str, nargs='+',
+                    help='The predictions file(s) to load and compute the scores for.')
+parser.add_argument('-p', '--parallel', metavar='parallel_jobs', type=int, default=None,
+                    help="The number of processes used to score multiple predictions files in parallel. Defaults to the number of cores.")
 args = parser.parse_args()
 
 # script_name = os.path.splitext(os.path.basename(__file__))[0]
@@ -29,6 +31,12 @@ config.root_dir = root_dir
 config.script = os.path.basename(__file__)
 amlb.resources.from_config(config)
 
-scores = amlb.TaskResult.score_from_predictions_file(args.predictions)
-log.info("\n\nScores computed from %s:\n%s", args.predictions, yaml.dump(dict(scores), default_flow_style=False))
-
+if len(args.predictions) == 1:
+    scores = amlb.TaskResult.score_from_predictions_file(args.predictions[0])
+    log.info("\n\nScores computed from %s:\n%s", args.predictions[0], yaml.dump(dict(scores), default_flow_style=False))
+else:
+    board = amlb.TaskResult.score_from_predictions_files(args.predictions, parallel_jobs=args.parallel)
+    if board.as_data_frame().empty:
+        log.warning("None of the %s predictions files could be scored.", len(args.predictions))
+    else:
+        log.info("\n\nScores computed from %s predictions files:\n%s", len(args.predictions), board.as_printable_data_frame().to_string())
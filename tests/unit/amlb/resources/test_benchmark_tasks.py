@@ -0,0 +1,36 @@
+import gc
+import weakref
+
+from amlb.resources import Resources
+from amlb.utils import Namespace as NS
+
+
+def mock_resources(calls):
+    def benchmark_definition(name, defaults=None):
+        calls.append(name)
+        return [NS(name=f"{name}_task")], name, None
+
+    res = NS(benchmark_definition=benchmark_definition)
+    # binding `benchmark_tasks` method to our resource mock: use pytest-mock instead?
+    res.benchmark_tasks = Resources.benchmark_tasks.__get__(res)
+    return res
+
+
+def test_benchmark_tasks_are_loaded_once_per_resources_instance():
+    calls = []
+    res = mock_resources(calls)
+    assert res.benchmark_tasks("bench") is res.benchmark_tasks("bench")
+    assert res.benchmark_tasks("other")[0].name == "other_task"
+    assert calls == ["bench", "other"]
+
+    mock_resources(calls).benchmark_tasks("bench")
+    assert calls == ["bench", "other", "bench"]
+
+
+def test_benchmark_tasks_cache_does_not_keep_resources_alive():
+    res = mock_resources([])
+    res.benchmark_tasks("bench")
+    ref = weakref.ref(res)
+    del res
+    gc.collect()
+    assert ref() is None
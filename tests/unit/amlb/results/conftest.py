@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pytest
+
+import amlb.resources
+from amlb.data import Feature
+from amlb.resources import Resources
+from amlb.results import TaskResult
+from amlb.utils import Namespace as NS, config_load
+
+root_dir = os.path.dirname(os.path.dirname(amlb.resources.__file__))
+
+
+@pytest.fixture
+def results_config(tmp_path, monkeypatch):
+    config = config_load(os.path.join(root_dir, "resources", "config.yaml"))
+    config.root_dir = root_dir
+    config.script = "pytest"
+    config.run_mode = "script"
+    config.sid = "test"
+    config.output_dir = str(tmp_path)
+    monkeypatch.setattr(amlb.resources, "__INSTANCE__", Resources(config))
+    return amlb.resources.config()
+
+
+@pytest.fixture
+def classes():
+    return ['a', 'b', 'c']
+
+
+@pytest.fixture
+def dataset(classes):
+    return NS(target=Feature(0, 'class', 'categorical', values=classes, is_target=True))
+
+
+@pytest.fixture
+def make_predictions(classes):
+    def make(labels=None, n=30, seed=0):
+        """random probabilities over `labels` (the dataset classes by default), with predictions and truth as labels"""
+        labels = classes if labels is None else labels
+        rng = np.random.default_rng(seed)
+        probabilities = rng.random((n, len(labels)))
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        predictions = np.array(labels)[probabilities.argmax(axis=1)]
+        truth = np.array(labels)[rng.integers(0, len(labels), n)]
+        return probabilities, predictions, truth
+    return make
+
+
+@pytest.fixture
+def save_predictions(dataset, classes):
+    def save(path, probabilities, predictions, truth, target_is_encoded=False, probabilities_labels=None):
+        """saves predictions given as labels, encoding them first (as indices of the probabilities columns) if `target_is_encoded`"""
+        if target_is_encoded:
+            encoding = {label: i for i, label in enumerate(probabilities_labels or classes)}
+            predictions = np.array([encoding[p] for p in predictions])
+            truth = np.array([encoding[t] for t in truth])
+        TaskResult.save_predictions(dataset, str(path),
+                                    predictions=predictions, truth=truth,
+                                    probabilities=probabilities, probabilities_labels=probabilities_labels,
+                                    target_is_encoded=target_is_encoded,
+                                    preview=False)
+    return save
@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from amlb.results import Scoreboard
+from amlb.utils import Namespace as NS
+
+
+def backups(directory):
+    backup_dir = os.path.join(directory, 'backup')
+    return os.listdir(backup_dir) if os.path.isdir(backup_dir) else []
+
+
+def test_backups_defaults(results_config):
+    assert results_config.results.backup.predictions is False
+    assert results_config.results.backup.scores is True
+
+
+@pytest.mark.use_disk
+@pytest.mark.parametrize('backup', [False, True])
+def test_predictions_are_backed_up_only_if_enabled(backup, make_predictions, save_predictions, results_config, tmp_path):
+    results_config.results.backup.predictions = backup
+    save_predictions(tmp_path / "predictions.csv", *make_predictions(seed=0))
+    assert backups(tmp_path) == []
+    save_predictions(tmp_path / "predictions.csv", *make_predictions(seed=1))
+    assert len(backups(tmp_path)) == (1 if backup else 0)
+
+
+@pytest.mark.use_disk
+@pytest.mark.parametrize('backup', [False, True])
+def test_scores_are_backed_up_only_if_enabled(backup, results_config, tmp_path):
+    results_config.results.backup.scores = backup
+    board = Scoreboard(scores=[NS(id='1', task='t', framework='f', fold=0, result=0.5)], scores_dir=str(tmp_path))
+    board.save()
+    assert backups(tmp_path) == []
+    board.save(append=True)  # appending to a file with the same format doesn't overwrite anything
+    assert backups(tmp_path) == []
+    board.save()
+    assert len(backups(tmp_path)) == (1 if backup else 0)
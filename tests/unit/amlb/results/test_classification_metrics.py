@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import accuracy_score, balanced_accuracy_score, f1_score, recall_score
+
+from amlb.results import ClassificationResult
+
+
+def make_result(classes, truth, predictions, target_is_encoded=False, seed=0):
+    rng = np.random.default_rng(seed)
+    probabilities = rng.random((len(truth), len(classes)))
+    df = pd.DataFrame(probabilities / probabilities.sum(axis=1, keepdims=True), columns=classes)
+    df = df.assign(predictions=predictions, truth=truth)
+    return ClassificationResult(df, target_is_encoded=target_is_encoded)
+
+
+def random_labels(classes, n, seed):
+    return np.array(classes)[np.random.default_rng(seed).integers(0, len(classes), n)]
+
+
+@pytest.mark.parametrize(
+    ['classes', 'truth_classes'],
+    [
+        (['a', 'b'], ['a', 'b']),
+        (['a', 'b', 'c'], ['a', 'b', 'c']),
+        (['a', 'b', 'c', 'd'], ['a', 'b', 'c', 'd']),
+        (['a', 'b', 'c', 'd'], ['a', 'c']),  # classes missing from truth
+        (['a', 'b'], ['b']),
+    ])
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_accuracy_metrics_match_sklearn(classes, truth_classes, seed):
+    truth = random_labels(truth_classes, 100, seed)
+    predictions = random_labels(classes, 100, seed + 100)
+    result = make_result(classes, truth, predictions)
+    assert result.acc() == pytest.approx(accuracy_score(result.truth, result.predictions))
+    assert result.balacc() == pytest.approx(balanced_accuracy_score(result.truth, result.predictions))
+
+
+@pytest.mark.parametrize('truth_classes', [['a', 'b'], ['a'], ['b']])
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_f1_matches_sklearn_on_binary_classification(truth_classes, seed):
+    classes = ['a', 'b']
+    truth = random_labels(truth_classes, 50, seed)
+    predictions = random_labels(classes, 50, seed + 100)
+    result = make_result(classes, truth, predictions)
+    expected = f1_score(result.truth, result.predictions, labels=result.labels, zero_division=0)
+    assert result.f1() == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_f1_matches_sklearn_when_columns_order_differs_from_encoding(seed):
+    classes = ['Yes', 'no']  # lexicographic order of the columns differs from the order of the normalized labels
+    truth = random_labels(classes, 50, seed)
+    predictions = random_labels(classes, 50, seed + 100)
+    result = make_result(classes, truth, predictions)
+    assert list(result.labels) == [1, 0]
+    expected = f1_score(result.truth, result.predictions, labels=result.labels, zero_division=0)
+    assert result.f1() == pytest.approx(expected)
+
+
+def test_f1_on_binary_classification_without_positive_class_is_zero():
+    result = make_result(['a', 'b'], truth=['a'] * 10, predictions=['a'] * 10)
+    assert result.f1() == 0
+
+
+def test_f1_is_not_supported_on_multiclass_classification():
+    result = make_result(['a', 'b', 'c'], truth=['a', 'b', 'c'], predictions=['a', 'b', 'c'])
+    with pytest.raises(ValueError):
+        result.f1()
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_per_class_errors_match_sklearn_recall(seed):
+    classes = ['a', 'b', 'c']
+    truth = random_labels(classes, 100, seed)
+    predictions = random_labels(classes, 100, seed + 100)
+    result = make_result(classes, truth, predictions)
+    errors = 1 - recall_score(result.truth, result.predictions, labels=result.labels, average=None)
+    assert result.mean_pce() == pytest.approx(errors.mean())
+    assert result.max_pce() == pytest.approx(errors.max())
+
+
+def test_accuracy_metrics_count_encoded_values_outside_labels_like_sklearn():
+    truth = np.array([0, 1, 2, 1, 0, 1])
+    predictions = np.array([0, 1, 1, 2, 1, 1])  # 2 is not a label of this binary problem
+    result = make_result(['a', 'b'], truth, predictions, target_is_encoded=True)
+    assert result.acc() == pytest.approx(accuracy_score(truth, predictions))
+    assert result.balacc() == pytest.approx(balanced_accuracy_score(truth, predictions))
@@ -0,0 +1,136 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import accuracy_score, log_loss
+
+from amlb.results import ClassificationResult, ErrorResult, TaskResult
+from amlb.utils import json_load
+
+
+def decoded(result):
+    return result.classes[result.predictions], result.classes[result.truth]
+
+
+@pytest.mark.use_disk
+@pytest.mark.parametrize('target_is_encoded', [False, True])
+@pytest.mark.parametrize('probabilities_labels', [None, ['a', 'b', 'c'], ['c', 'a', 'b']])
+def test_predictions_round_trip(target_is_encoded, probabilities_labels, classes, make_predictions, save_predictions,
+                                results_config, tmp_path):
+    labels = probabilities_labels or classes
+    probabilities, predictions, truth = make_predictions(labels)
+    save_predictions(tmp_path / "predictions.csv", probabilities, predictions, truth,
+                     target_is_encoded=target_is_encoded, probabilities_labels=probabilities_labels)
+
+    assert json_load(str(tmp_path / "predictions.meta.json"), as_namespace=True).target_is_encoded is True
+    result = TaskResult.load_predictions(str(tmp_path / "predictions.csv"))
+    assert isinstance(result, ClassificationResult)
+    assert list(result.classes) == classes
+    loaded_predictions, loaded_truth = decoded(result)
+    assert (loaded_predictions == predictions).all()
+    assert (loaded_truth == truth).all()
+    order = [labels.index(c) for c in classes]
+    assert np.allclose(result.probabilities, probabilities[:, order])
+
+
+@pytest.mark.use_disk
+@pytest.mark.parametrize('probabilities_labels', [['a', 'c'], ['c', 'a']])
+def test_predictions_with_subset_of_classes_are_not_encoded_with_dataset_classes(probabilities_labels, make_predictions, save_predictions,
+                                                                                 results_config, tmp_path):
+    probabilities, predictions, truth = make_predictions(probabilities_labels)
+    save_predictions(tmp_path / "predictions.csv", probabilities, predictions, truth,
+                     probabilities_labels=probabilities_labels)
+
+    assert json_load(str(tmp_path / "predictions.meta.json"), as_namespace=True).target_is_encoded is False
+    saved = pd.read_csv(tmp_path / "predictions.csv", dtype=str)
+    assert set(saved.predictions) <= {'a', 'c'}
+    result = TaskResult.load_predictions(str(tmp_path / "predictions.csv"))
+    assert isinstance(result, ClassificationResult)
+    assert result.evaluate('acc') == (pytest.approx(accuracy_score(truth, predictions)), None)
+    order = [probabilities_labels.index(c) for c in ['a', 'c']]
+    expected_logloss = log_loss(truth, probabilities[:, order], labels=['a', 'c'])
+    assert result.evaluate('logloss') == (pytest.approx(expected_logloss), None)
+
+
+@pytest.mark.use_disk
+def test_encoded_predictions_with_subset_of_classes_are_remapped_to_saved_columns(make_predictions, save_predictions,
+                                                                                  results_config, tmp_path):
+    probabilities_labels = ['c', 'a']
+    probabilities, predictions, truth = make_predictions(probabilities_labels)
+    save_predictions(tmp_path / "predictions.csv", probabilities, predictions, truth,
+                     target_is_encoded=True, probabilities_labels=probabilities_labels)
+
+    result = TaskResult.load_predictions(str(tmp_path / "predictions.csv"))
+    assert isinstance(result, ClassificationResult)
+    loaded_predictions, loaded_truth = decoded(result)
+    assert (loaded_predictions == predictions).all()
+    assert (loaded_truth == truth).all()
+
+
+@pytest.mark.parametrize(
+    ['labels', 'values', 'encoded'],
+    [
+        (['a', 'b', 'c'], ['0', '1', '2'], True),
+        (['a', 'b', 'c'], ['a', 'b'], False),
+        (['1', '2', '3'], ['0', '1'], True),
+        (['1', '2', '3'], ['1', '2'], False),
+        (['1', '2', '3'], ['1', '3'], False),
+        (['0', '1'], ['0', '1'], False),
+        (['a', 'b'], ['0', '2'], False),
+    ])
+def test_guess_target_is_encoded(labels, values, encoded):
+    df = pd.DataFrame(np.full((len(values), len(labels)), 1 / len(labels)), columns=labels)
+    df = df.assign(predictions=values, truth=list(reversed(values)))
+    assert TaskResult._guess_target_is_encoded(df) is encoded
+
+
+@pytest.mark.use_disk
+def test_encoded_predictions_without_metadata_are_guessed(make_predictions, save_predictions, results_config, tmp_path):
+    probabilities, predictions, truth = make_predictions()
+    save_predictions(tmp_path / "predictions.csv", probabilities, predictions, truth)
+    os.remove(tmp_path / "predictions.meta.json")
+
+    result = TaskResult.load_predictions(str(tmp_path / "predictions.csv"))
+    assert isinstance(result, ClassificationResult)
+    assert result.target_is_encoded
+    loaded_predictions, loaded_truth = decoded(result)
+    assert (loaded_predictions == predictions).all()
+    assert (loaded_truth == truth).all()
+
+
+@pytest.mark.use_disk
+def test_labels_predictions_without_metadata_are_encoded_on_load(classes, make_predictions, results_config, tmp_path):
+    probabilities, predictions, truth = make_predictions()
+    pd.DataFrame(probabilities, columns=classes).assign(predictions=predictions, truth=truth) \
+        .to_csv(tmp_path / "predictions.csv", index=False)
+
+    result = TaskResult.load_predictions(str(tmp_path / "predictions.csv"))
+    assert isinstance(result, ClassificationResult)
+    assert not result.target_is_encoded
+    loaded_predictions, loaded_truth = decoded(result)
+    assert (loaded_predictions == predictions).all()
+    assert (loaded_truth == truth).all()
+
+
+@pytest.mark.use_disk
+def test_stale_metadata_is_ignored_when_predictions_are_not_encoded(classes, make_predictions, save_predictions,
+                                                                    results_config, tmp_path):
+    probabilities, predictions, truth = make_predictions()
+    save_predictions(tmp_path / "predictions.csv", probabilities, predictions, truth)
+    # predictions overwritten with labels, e.g. by a framework writing them directly.
+    pd.DataFrame(probabilities, columns=classes).assign(predictions=predictions, truth=truth) \
+        .to_csv(tmp_path / "predictions.csv", index=False)
+
+    result = TaskResult.load_predictions(str(tmp_path / "predictions.csv"))
+    assert isinstance(result, ClassificationResult)
+    loaded_predictions, loaded_truth = decoded(result)
+    assert (loaded_predictions == predictions).all()
+    assert (loaded_truth == truth).all()
+
+
+@pytest.mark.use_disk
+def test_invalid_predictions_are_still_reported_as_error(results_config, tmp_path):
+    pd.DataFrame(dict(a=['x', 'y'], b=[0.5, 0.5], predictions=['a', 'b'], truth=['a', 'b'])) \
+        .to_csv(tmp_path / "predictions.csv", index=False)
+    assert isinstance(TaskResult.load_predictions(str(tmp_path / "predictions.csv")), ErrorResult)
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from amlb.data import Feature
+from amlb.results import ClassificationResult, RegressionResult, TaskResult
+from amlb.utils import Namespace as NS
+
+
+@pytest.mark.use_disk
+@pytest.mark.parametrize("fmt", ['csv', 'feather', 'parquet'])
+def test_predictions_are_saved_and_loaded_in_configured_format(fmt, classes, make_predictions, save_predictions,
+                                                               results_config, tmp_path):
+    if fmt != 'csv':
+        pytest.importorskip("pyarrow")
+    results_config.results.predictions_format = fmt
+    probabilities, predictions, truth = make_predictions()
+    save_predictions(tmp_path / "predictions.csv", probabilities, predictions, truth)
+    saved = tmp_path / f"predictions.{fmt}"
+    assert saved.is_file()
+    assert (fmt == 'csv') or not (tmp_path / "predictions.csv").exists()
+
+    result = TaskResult.load_predictions(str(saved))
+    assert isinstance(result, ClassificationResult)
+    assert list(result.classes) == classes
+    assert np.allclose(result.probabilities, probabilities)
+    assert (result.predictions == result.target.label_encoder.transform(predictions)).all()
+    assert (result.truth == result.target.label_encoder.transform(truth)).all()
+
+
+@pytest.mark.use_disk
+@pytest.mark.parametrize("fmt", ['csv', 'feather', 'parquet'])
+def test_regression_predictions_are_saved_and_loaded_in_configured_format(fmt, results_config, tmp_path):
+    if fmt != 'csv':
+        pytest.importorskip("pyarrow")
+    results_config.results.predictions_format = fmt
+    rng = np.random.default_rng(0)
+    predictions, truth = rng.random(20), rng.random(20)
+    dataset = NS(target=Feature(0, 'target', 'real', is_target=True))
+    TaskResult.save_predictions(dataset, str(tmp_path / "predictions.csv"),
+                                predictions=predictions, truth=truth, preview=False)
+
+    result = TaskResult.load_predictions(str(tmp_path / f"predictions.{fmt}"))
+    assert isinstance(result, RegressionResult)
+    assert np.allclose(result.predictions, predictions)
+    assert np.allclose(result.truth, truth)
+
+
+@pytest.mark.use_disk
+@pytest.mark.parametrize("fmt", ['csv', 'feather', 'parquet'])
+def test_score_from_predictions_file_accepts_all_predictions_formats(fmt, make_predictions, save_predictions,
+                                                                    results_config, tmp_path):
+    if fmt != 'csv':
+        pytest.importorskip("pyarrow")
+    results_config.results.predictions_format = fmt
+    probabilities, predictions, truth = make_predictions()
+    save_predictions(tmp_path / "fw.task.0.csv", probabilities, predictions, truth)
+
+    scores = TaskResult.score_from_predictions_file(str(tmp_path / f"fw.task.0.{fmt}"))
+    assert scores.framework == 'fw'
+    assert scores.task == 'task'
+    assert scores.fold == 0
+    assert scores.metric == 'logloss'
+    assert np.isfinite(scores.result)
+
+
+@pytest.mark.use_disk
+def test_score_from_predictions_file_rejects_unknown_extension(results_config, tmp_path):
+    path = tmp_path / "fw.task.0.txt"
+    path.touch()
+    assert TaskResult.score_from_predictions_file(str(path)) is None
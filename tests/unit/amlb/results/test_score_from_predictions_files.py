@@ -0,0 +1,40 @@
+import multiprocessing
+
+import pytest
+
+from amlb.results import Scoreboard, TaskResult
+
+
+@pytest.fixture(params=['fork', 'spawn'])
+def start_method(request, monkeypatch):
+    """the executor uses the default multiprocessing context: spawned processes don't inherit the app resources"""
+    if request.param not in multiprocessing.get_all_start_methods():
+        pytest.skip(f"{request.param} start method is not available")
+    context = multiprocessing.get_context(request.param)
+    get_context = multiprocessing.get_context
+    monkeypatch.setattr(multiprocessing, 'get_context', lambda method=None: context if method is None else get_context(method))
+    return request.param
+
+
+@pytest.mark.use_disk
+def test_predictions_files_are_scored_in_parallel_processes(start_method, make_predictions, save_predictions,
+                                                            results_config, tmp_path):
+    paths = []
+    for task, fold in [('t1', 0), ('t1', 1), ('t2', 0)]:
+        path = tmp_path / f"fw.{task}.{fold}.csv"
+        save_predictions(path, *make_predictions(seed=fold))
+        paths.append(str(path))
+    paths.append(str(tmp_path / "wrong_name.csv"))
+
+    board = TaskResult.score_from_predictions_files(paths, parallel_jobs=2)
+    assert isinstance(board, Scoreboard)
+    df = board.as_data_frame()
+    assert list(zip(df.task, df.fold)) == [('t1', 0), ('t1', 1), ('t2', 0)]
+    assert set(df.framework) == {'fw'}
+    assert list(df.result) == [TaskResult.score_from_predictions_file(path).result for path in paths[:3]]
+
+
+@pytest.mark.use_disk
+def test_scoring_no_valid_predictions_file_returns_an_empty_scoreboard(results_config, tmp_path):
+    board = TaskResult.score_from_predictions_files([str(tmp_path / "wrong_name.csv")], parallel_jobs=1)
+    assert board.as_data_frame().empty
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from amlb.results import Scoreboard, _round_decimals, _round_significant
+from amlb.utils import Namespace as NS
+
+
+@pytest.mark.parametrize(
+    ['value', 'printed'],
+    [
+        (0.9750925, 0.975093),
+        (0.123456789, 0.123457),
+        (1e-310, 1e-310),
+        (12345678.9, 12345700.0),
+    ])
+def test_printable_scores_are_formatted_with_6_significant_digits(value, printed):
+    board = Scoreboard(scores=[NS(id='1', task='t', framework='f', fold=0, result=value)], scores_dir='.')
+    assert board.as_printable_data_frame().result[0] == printed
+
+
+@pytest.mark.parametrize(
+    ['value', 'printed'],
+    [
+        (0.05, 0.1),
+        (1.25, 1.2),
+        (12.34, 12.3),
+    ])
+def test_printable_durations_are_formatted_with_1_decimal(value, printed):
+    board = Scoreboard(scores=[NS(id='1', task='t', framework='f', fold=0, duration=value)], scores_dir='.')
+    assert board.as_printable_data_frame().duration[0] == printed
+
+
+def test_vectorized_rounding_matches_printed_values():
+    rng = np.random.default_rng(0)
+    values = np.concatenate([
+        rng.integers(0, 2**63, 100000, dtype=np.int64).view(float),  # any double, including subnormals, inf and nan
+        rng.random(100000),
+        np.round(rng.random(100000) * 100, 3),  # many ties
+        [0.9750925, 0.05, 2.5, 999999.5, 1e-310, 5e-324, 0., -0., 1e22, 1e23],
+    ])
+    assert np.array_equal(_round_significant(values, 6), [float(f"{v:.6g}") for v in values], equal_nan=True)
+    assert np.array_equal(_round_decimals(values, 1), [float(f"{v:.1f}") for v in values], equal_nan=True)
+
+
+def test_printable_nanable_int_columns_are_truncated_or_empty():
+    board = Scoreboard(scores=[NS(id='1', task='t', framework='f', fold=0, models_count=3.0, seed=None),
+                               NS(id='2', task='t', framework='f', fold=1, models_count=None, seed=42)],
+                       scores_dir='.')
+    df = board.as_printable_data_frame()
+    assert list(df.fold) == ['0', '1']
+    assert list(df.models_count) == ['3', '']
+    assert list(df.seed) == ['', '42']
+    assert np.isnan(board.as_data_frame().models_count[1])  # cached frame is left untouched
+
+
+def test_append_drops_duplicates_and_reindexes_scores():
+    board = Scoreboard(scores=[NS(id='1', task='t', framework='f', fold=0, result=0.5)], scores_dir='.')
+    other = Scoreboard(scores=[NS(id='1', task='t', framework='f', fold=1, result=0.6)], scores_dir='.')
+    df = board.append(other).append(board).as_data_frame()
+    assert list(df.fold) == [0, 1]
+    assert list(df.index) == [0, 1]
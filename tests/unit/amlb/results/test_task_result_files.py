@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from amlb.results import ClassificationResult, NoResult, TaskResult
+from amlb.utils import Namespace as NS, json_dump
+
+
+@pytest.fixture
+def save_fold(make_predictions, save_predictions):
+    def save(fold_dir, metadata=True):
+        save_predictions(os.path.join(fold_dir, "predictions.csv"), *make_predictions())
+        if metadata:
+            json_dump(dict(framework='fw', metric='logloss', metrics=['logloss', 'acc']), os.path.join(fold_dir, "metadata.json"))
+    return save
+
+
+@pytest.fixture
+def fs_spy(monkeypatch):
+    calls = []
+    for name in ['isfile', 'isdir', 'exists']:
+        fn = getattr(os.path, name)
+        monkeypatch.setattr(os.path, name, lambda p, _fn=fn, _name=name: calls.append((_name, p)) or _fn(p))
+    listdir = os.listdir
+    monkeypatch.setattr(os, 'listdir', lambda p: calls.append(('listdir', p)) or listdir(p))
+    return calls
+
+
+@pytest.mark.use_disk
+def test_fold_files_are_looked_up_from_a_single_listing(save_fold, results_config, tmp_path, fs_spy):
+    fold_dir = tmp_path / 't' / '0'
+    fold_dir.mkdir(parents=True)
+    save_fold(str(fold_dir))
+    fs_spy.clear()
+
+    task_result = TaskResult(NS(name='t', id='t'), 0, 'c', predictions_dir=str(tmp_path))
+    result = task_result.get_result()
+    metadata = task_result.get_metadata()
+
+    assert isinstance(result, ClassificationResult)
+    assert result.target_is_encoded
+    assert metadata.framework == 'fw'
+    assert [call for call in fs_spy if str(fold_dir) in str(call[1])] == [('listdir', str(fold_dir))]
+
+
+@pytest.mark.use_disk
+def test_missing_fold_files_are_reported_from_the_listing(results_config, tmp_path, fs_spy):
+    task_result = TaskResult(NS(name='t', id='t'), 0, 'c', predictions_dir=str(tmp_path))
+    assert isinstance(task_result.get_result(), NoResult)
+    assert task_result.get_metadata().framework is None
+    assert [name for name, _ in fs_spy] == ['listdir']
+
+
+@pytest.mark.use_disk
+def test_predictions_loaded_from_arbitrary_path_are_probed_on_disk(save_fold, results_config, tmp_path):
+    save_fold(str(tmp_path), metadata=False)
+    assert isinstance(TaskResult.load_predictions(str(tmp_path / "predictions.csv")), ClassificationResult)
+    assert isinstance(TaskResult.load_predictions(str(tmp_path / "missing.csv")), NoResult)
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from amlb.results import ClassificationResult, ErrorResult, TaskResult
+
+
+def predictions_frame(classes, make_predictions, target_is_encoded=False):
+    probabilities, predictions, truth = make_predictions(classes)
+    if target_is_encoded:
+        predictions, truth = (np.searchsorted(classes, v) for v in (predictions, truth))
+    return pd.DataFrame(probabilities, columns=classes).assign(predictions=predictions, truth=truth)
+
+
+@pytest.mark.parametrize('target_is_encoded', [False, True])
+def test_predictions_matching_the_highest_probability_are_valid(target_is_encoded, classes, make_predictions):
+    df = predictions_frame(classes, make_predictions, target_is_encoded)
+    TaskResult.validate_predictions(df, target_is_encoded=target_is_encoded)
+
+
+@pytest.mark.parametrize('target_is_encoded', [False, True])
+def test_predictions_not_matching_the_highest_probability_are_invalid(target_is_encoded, classes, make_predictions):
+    df = predictions_frame(classes, make_predictions, target_is_encoded)
+    wrong = (df.iloc[3, :-2].to_numpy(dtype=float).argmax() + 1) % len(classes)
+    df.loc[3, 'predictions'] = wrong if target_is_encoded else classes[wrong]
+    with pytest.raises(AssertionError, match="highest probability"):
+        TaskResult.validate_predictions(df, target_is_encoded=target_is_encoded)
+
+
+@pytest.mark.parametrize(
+    ['columns', 'error'],
+    [
+        (['b', 'a', 'c'], "not sorted"),
+        (['a', 'a', 'c'], "same label"),
+    ])
+def test_predictors_columns_must_be_sorted_and_unique(columns, error, classes, make_predictions):
+    df = predictions_frame(classes, make_predictions)
+    df.columns = columns + ['predictions', 'truth']
+    with pytest.raises(AssertionError, match=error):
+        TaskResult.validate_predictions(df)
+
+
+def test_encoded_predictions_out_of_predictors_range_are_invalid(classes, make_predictions):
+    df = predictions_frame(classes, make_predictions, target_is_encoded=True)
+    df.loc[0, 'predictions'] = len(classes)
+    with pytest.raises(AssertionError, match="unexpected values"):
+        TaskResult.validate_predictions(df, target_is_encoded=True)
+
+
+@pytest.mark.use_disk
+def test_predictions_are_validated_on_load_in_test_mode(classes, make_predictions, save_predictions, results_config, tmp_path):
+    results_config.test_mode = True
+    probabilities, predictions, truth = make_predictions()
+    save_predictions(tmp_path / "predictions.csv", probabilities, predictions, truth)
+    assert isinstance(TaskResult.load_predictions(str(tmp_path / "predictions.csv")), ClassificationResult)
+
+    predictions[0] = next(c for c in classes if c != predictions[0])
+    save_predictions(tmp_path / "predictions.csv", probabilities, predictions, truth)
+    result = TaskResult.load_predictions(str(tmp_path / "predictions.csv"))
+    assert isinstance(result, ErrorResult)
+    assert "highest probability" in result.info